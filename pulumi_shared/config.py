@@ -0,0 +1,15 @@
+"""Cached Pulumi config lookups shared across the layers"""
+
+from functools import lru_cache
+
+
+@lru_cache(maxsize=1)
+def aws_region() -> str:
+    """Resolve aws:region at most once per process.
+
+    Config lookups go through the language host; the region is read by
+    several layers in the same program, so the single resolved value is
+    memoized instead of repeating the round-trip per deploy().
+    """
+    from pulumi import Config
+    return Config("aws").require("region")
@@ -0,0 +1,33 @@
+"""Cached AWS Secrets Manager lookups shared across the ARC layers"""
+
+from functools import lru_cache
+
+try:
+    import orjson as _json
+except ImportError:  # pragma: no cover - orjson is in requirements.txt
+    import json as _json
+
+
+@lru_cache(maxsize=None)
+def get_secret_version(secret_id: str):
+    """Fetch a secret version at most once per process.
+
+    Each get_secret_version call is a synchronous Secrets Manager round-trip
+    that blocks program evaluation before any downstream resource can
+    register. The layers re-read the same secrets on every preview/up, so
+    memoizing the data-source result removes the repeat round-trips.
+    """
+    import pulumi_aws as aws
+    return aws.secretsmanager.get_secret_version(secret_id=secret_id)
+
+
+@lru_cache(maxsize=None)
+def get_secret_json(secret_id: str) -> dict:
+    """Fetch a JSON secret and parse it once per process.
+
+    The data-source result is a plain string known at plan time, so the
+    payload is parsed synchronously into a plain dict rather than deferred
+    through an Output.apply — downstream consumers get ordinary strings and
+    no extra async graph nodes.
+    """
+    return _json.loads(get_secret_version(secret_id).secret_string)
@@ -11,6 +11,13 @@ import time
 import urllib.request
 import yaml
 
+# libyaml-backed dumper/loader when PyYAML was built with it (~10x faster
+# than the pure-Python implementations); fall back otherwise
+try:
+    from yaml import CSafeDumper as _Dumper, CSafeLoader as _Loader
+except ImportError:
+    from yaml import SafeDumper as _Dumper, SafeLoader as _Loader
+
 
 def cli_args():
     parser = argparse.ArgumentParser(
@@ -27,13 +34,13 @@ def main():
     versions = ''
 
     with open(args.terrafile) as f:
-        tf_modules = yaml.load(f, Loader=yaml.SafeLoader)
+        tf_modules = yaml.load(f, Loader=_Loader)
 
     subprocess.run(['rm', '-rf', args.modules, ])
 
     for idx, (mod_folder, mod_spec, ) in enumerate(tf_modules.items()):
         print(f'Processing {mod_folder} with spec ({idx + 1} of {len(tf_modules)}):')
-        print(f'{yaml.dump(mod_spec, default_flow_style=False)}')
+        print(f'{yaml.dump(mod_spec, Dumper=_Dumper, default_flow_style=False)}')
         print("=========================================")
 
         source = mod_spec['source']